@@ -3,6 +3,68 @@ Utility module providing the graph data structure, designed for simulating Veril
 The member functions aid in building, modifying, and simulating the graph.
 """
 import random
+import functools
+from collections import deque
+from sys import intern
+
+
+# suffixes of the identifiers of the copies made by triplicateBlck(), each
+# followed by the index of the copy
+_TRIP_BLCK_SUFFIX = '_tripd78'    # triplicated blcks
+_TRIP_OP_SUFFIX = '_trip728'      # outputs of the triplicated blcks
+
+
+@functools.lru_cache(maxsize=4096)
+def _reversedBinaryStr(cfg_int, cfg_bits):
+    """
+        Converts a config integer to a binary string of length cfg_bits in the
+        reverse format (least significant bit first). Memoized, since netlists
+        reuse a small number of distinct configs.
+
+        Returns
+        -------
+        Binary string. Eg: _reversedBinaryStr(0xc2, 8) -> '01000011'
+    """
+    return format(cfg_int, '0%db' % cfg_bits)[::-1]
+
+
+def _packSlow(vals):
+    """
+        Fallback of the functions generated by _ipPacker() for inputs which
+        are not all 0 or 1.
+
+        Returns
+        -------
+        -1 if any of the values is None, else None (an input in Z state).
+    """
+    return -1 if None in vals else None
+
+
+@functools.lru_cache(maxsize=None)
+def _ipPacker(k):
+    """
+        Generates the function packing the values of k inputs into an integer,
+        the first input being the most significant bit. The number of inputs
+        is fixed in the generated code, so no loop or test is run per input.
+
+        Returns
+        -------
+        function(values, slots) -> int, returning the packed integer, None if
+        an input is in Z state, or -1 if an input has no value yet.
+        Eg: _ipPacker(3)(['Z', 1, 0, 1], (1, 2, 3)) -> 5
+    """
+    names = ['v%d' % j for j in range(k)]
+    src = 'def pack(values, slots):\n'
+    src += '    %s, = slots\n' % ', '.join('s%d' % j for j in range(k))
+    src += '    %s, = %s,\n' % (', '.join(names), ', '.join('values[s%d]' % j for j in range(k)))
+    src += '    try:\n'
+    src += '        return %s\n' % ' | '.join('(%s << %d)' % (v, k - 1 - j) for j, v in enumerate(names))
+    src += '    except TypeError:\n'
+    src += '        return _packSlow((%s,))\n' % ', '.join(names)
+    namespace = {'_packSlow': _packSlow}
+    exec(compile(src, '<_ipPacker(%d)>' % k, 'exec'), namespace)
+    return namespace['pack']
+
 
 class VerilogGraph:
     """
@@ -15,24 +77,41 @@ class VerilogGraph:
             - prime_io node : 
                 {'primeIo_id': 'io_type', 1|0|Z}
             - cfg_blck node : 
-                {'cfgBlck_id': [('ip0', 'ip1', 'ip3'), ['op', 1|0|Z], 'cfg_string']}
+                {'cfgBlck_id': [('ip0', 'ip1', 'ip3'), ['op', 1|0|Z], cfg_int, cfg_bits]}
+                (cfg_int holds the truth table: bit i is the output for the inputs
+                 packed as i, with the first input as the most significant bit;
+                 cfg_bits is the width of the truth table, 4*len(config))
             - ari_blck node:
-                {'ariBlck_id': [('A', 'B', 'C', 'D', 'FCI'), [['Y', 1|0|Z], ['S', 1|0|Z], ['FCO', 1|0|Z]], 'cfg_string']}
+                {'ariBlck_id': [('A', 'B', 'C', 'D', 'FCI'), [['Y', 1|0|Z], ['S', 1|0|Z], ['FCO', 1|0|Z]], cfg_int, cfg_bits]}
             - tribuf node:
                 {'tribuf_id': [(input, ctrl), [ctrl], [output, 1|0|Z]] ([ctrl] is added to differentiate tribuf node from other nodes)
             - and_gate node:
                 {'and_gate_id': [('ip0', 'ip1', 'ip3'), ['A', output, 1|0|Z]]
             - or_gate node:
                 {'or_gate_id': [('ip0', 'ip1', 'ip3'), ['O', output, 1|0|Z]]
+        verbose : boolean
+            If set True, the simulation prints a message for every processed
+            blck. Errors are printed regardless.
         __prime_ip : list
-            list of primary inputs in the VerilogGraph. Private attribute used to
-            better process the blcks
+            list of primary inputs in the VerilogGraph, maintained by addPrimeIo().
+            Private attribute used to better process the blcks
+        __prime_ip_set : set
+            Same as __prime_ip, for constant time membership tests
         __prime_op : list
             list of primary outputs in the VerilogGraph. Private attribute used to
             better process blcks
+        __prime_op_set : set
+            Same as __prime_op, for constant time membership tests while
+            processing blcks
         __op_fanout : dictionary
-            Key represents a driving output (from a node) and the value is a list of 
+            Key represents a driving output (from a cfg or ari node) and the value is a list of
             size 'n' containing identifiers of fan out wires
+        __prime_io_ids, __cfg_ids, __ari_ids, __tribuf_ids, __gate_ids : list
+            IDs of the nodes of each type, in the order they were added. Used
+            to list and process the nodes without scanning the whole dGrph
+        __node_type : dictionary
+            Maps every node ID to its type ('io', 'cfg', 'ari', 'tribuf' or 'gate'),
+            so the type of a node is not inferred from the lengths of its fields
 
         Methods
         -------
@@ -42,7 +121,6 @@ class VerilogGraph:
                     * addCfgBlck(blck_id, inputs, output, config)
                     * addAriBlck(blck_id, inputs, outputs, config)
                     * addTribuf(blck_id, input, ctrl, output)
-                    * __addGate(blck_id, gate_type, input, output)
                     * triplicateBlck(blck_id)
                     * listPrimeIos()
                     * listCfgBlcks()
@@ -59,60 +137,113 @@ class VerilogGraph:
                     * setIpValue()
                     * setRandomInputs()
                     * simulate(inputs, bit_str)
+                    * simulateBatch(inputs, bit_strs)
 
             Private:
                     * __init__()
+                    * __invalidateCache()
                 Graph creation methods
-                    * __convertToBinaryStr(hex_str)
+                    * __addFanout(driver, fanOps)
+                    * __addGate(blck_id, gate_type, input, output)
+                    * __addVoter(new_ids, trip_ops, op, k)
                 Graph simulation methods
-                    * __charToBool(char)
-                    * __boolToChar(boolean)
                     * __simSetup()
+                    * __buildTopoOrder()
+                    * __buildKernel()
+                    * __runKernel(values)
+                    * __blckOps(blck_id)
                     * __processCgfBlck()
+                    * __evalAri(INIT, ip_int)
                     * __processAriBlck()
                     * __processTribuf()
                     * __processGates()
                     * __processBlcks()
+                    * __abortBlcks()
+                    * __buildBatchOrder(io_slot, io_src)
+                    * __compileBatch()
+                    * __lutLanesExpr(lut, ips)
+                    * __ariLanesExprs(INIT, ips, lines)
 
     """
 
-    def __init__(self):
+    # fixed set of attributes, which keeps instances compact and attribute
+    # access off the instance dictionary
+    __slots__ = (
+        'dGrph', 'verbose', '__prime_ip', '__prime_ip_set', '__prime_op',
+        '__prime_op_set', '__op_fanout',
+        '__prime_io_ids', '__cfg_ids', '__ari_ids', '__tribuf_ids', '__gate_ids',
+        '__node_type', '__cache_prime_ios', '__cache_cfg', '__cache_ari',
+        '__cache_tribuf', '__cache_gate', '__cache_inter', '__topo_order',
+        '__kernel', '__batch_fn', '__op_writeback', '__fanout_writeback',
+        '__sim_reset',
+    )
+
+    def __init__(self, verbose = False):
         """
             Constructor
 
             Instantiates an empty dictionary.
+
+            Parameters
+            ----------
+            verbose : boolean (default: False)
+                See the attribute verbose.
         """
         self.dGrph = {}
+        self.verbose = verbose
         self.__prime_ip = []
+        self.__prime_ip_set = set()
         self.__prime_op = []
+        self.__prime_op_set = set()
         self.__op_fanout = {}
-    
-    def __convertToBinaryStr(self, hex_str):
-        """
-            Converts a hexadecimal string of n length to binary string of 4*n length
-
-            Parameters
-            ----------
-            hex_str : str
-                Hexadecimal string. Eg: '1ab' or '1AB'
-
-            Returns
-            -------
-            Binary string of length 4*n. Eg: '000110101011'
-        """     
-        final_bi_str = ''
-        for c in hex_str:
-            bi_str = bin(int(c, 16))[2:]
-            if len(bi_str) != 4:
-                bi_str = (4 - len(bi_str)%4)*'0' + bi_str
-            final_bi_str += bi_str
-        
-        # sanity check
-        if not(len(final_bi_str)%4 == 0 and (len(hex_str)*4) == len(final_bi_str)):
-            print('Problem in hex2bi conversion')
-        
-        return final_bi_str
 
+        # IDs of the nodes of each type, in the order they were added
+        self.__prime_io_ids = []
+        self.__cfg_ids = []
+        self.__ari_ids = []
+        self.__tribuf_ids = []
+        self.__gate_ids = []
+        # node ID -> type of the node: 'io', 'cfg', 'ari', 'tribuf' or 'gate'
+        self.__node_type = {}
+
+        # cached node listings, rebuilt lazily after the graph is modified
+        self.__cache_prime_ios = None
+        self.__cache_cfg = None
+        self.__cache_ari = None
+        self.__cache_tribuf = None
+        self.__cache_gate = None
+        self.__cache_inter = None
+
+        # evaluation order of the blcks, see __buildTopoOrder()
+        self.__topo_order = None
+        # flat evaluation program of the blcks, see __buildKernel()
+        self.__kernel = None
+        # compiled evaluation function for simulateBatch(), see __compileBatch()
+        self.__batch_fn = None
+        # primary output nodes written through by the blcks, see __buildKernel()
+        self.__op_writeback = {}
+        self.__fanout_writeback = {}
+        # output values cleared before simulation, see __simSetup()
+        self.__sim_reset = None
+
+    def __invalidateCache(self):
+        """
+            Drops the cached node listings. Must be called whenever a node is
+            added to or removed from dGrph.
+        """
+        self.__cache_prime_ios = None
+        self.__cache_cfg = None
+        self.__cache_ari = None
+        self.__cache_tribuf = None
+        self.__cache_gate = None
+        self.__cache_inter = None
+        self.__topo_order = None
+        self.__kernel = None
+        self.__batch_fn = None
+        self.__op_writeback = {}
+        self.__fanout_writeback = {}
+        self.__sim_reset = None
+    
     def addPrimeIo(self, io_id, io_type):
         """
             Adds a node of type prime_io to the graph.
@@ -123,31 +254,47 @@ class VerilogGraph:
                 Identifier for the prime_io node.
             io_type : char
                 Should be either 'i' (for input) or 'o' (for output)
+
+            Returns
+            -------
+            True if the node was added, False otherwise (the reason is printed).
         """
         # Eliminating basic outlier conditions
         if(io_type not in ['i', 'o']):
             print('Invalid io_type. No node added.')
-            return
-        if io_id in self.dGrph:
-            print('io_id already exists. No node added.')
-            return
-        
+            return False
+
+        # identifiers are interned, so that the many lookups and comparisons
+        # between them mostly reduce to identity checks
+        io_id = intern(io_id)
         if io_id == 'VCC':
-            self.dGrph[io_id] = [io_type, 1]
+            node = [io_type, 1]
         elif io_id == 'GND':
-            self.dGrph[io_id] = [io_type, 0]
+            node = [io_type, 0]
         else:
-            self.dGrph[io_id] = [io_type, None]
+            node = [io_type, None]
+        # adding the node unless the id exists, with a single lookup
+        if self.dGrph.setdefault(io_id, node) is not node:
+            print('io_id already exists. No node added.')
+            return False
+        self.__prime_io_ids.append(io_id)
+        self.__node_type[io_id] = 'io'
+        self.__invalidateCache()
 
+        if io_type == 'i':
+            self.__prime_ip.append(io_id)
+            self.__prime_ip_set.add(io_id)
         if io_type == 'o':
-            self.__prime_op.append(io_id) 
+            self.__prime_op.append(io_id)
+            self.__prime_op_set.add(io_id)
+        return True
 
     def addCfgBlck(self, cfg_id, inputs, output, config):
         """
             Adds a node of type cfg_blck to the graph.
-            Note: For faster simulation, the 'config' is stored in the reverse format
-            of what is given as input. But while using function: printCfgBlcks(), 
-            the actual 'config' is shown.
+            Note: For faster simulation, the 'config' is stored as an integer truth
+            table, along with its width in bits. listCfgBlcks() returns it as a binary
+            string in the reverse format, but printCfgBlcks() shows the actual 'config'.
 
 
             Parameters
@@ -168,39 +315,61 @@ class VerilogGraph:
             Example usage
             -------------
             addCfgBlck('blck1', ['ip1', 'ip2', 'ip3'], 'out_1', '1c')
+
+            Returns
+            -------
+            True if the node was added, False otherwise (the reason is printed).
         """
         # Eliminating basic outlier conditions
         if not isinstance(output, (list)):
             print("Please enter the output identifier as a list.")
-            return
+            return False
+        cfg_id = intern(cfg_id)
+        inputs = tuple(map(intern, inputs))
+        output = list(map(intern, output))
+        if cfg_id in self.dGrph:
+            print('cfg_id already exists. No node added.')
+            return False
         if (len(inputs) == 1 and len(config) == 1):
-            self.dGrph[cfg_id] = [tuple(inputs), [output[0], None], self.__convertToBinaryStr(config)[::-1]]
+            self.dGrph[cfg_id] = [inputs, [output[0], None], int(config, 16), 4*len(config)]
+            self.__cfg_ids.append(cfg_id)
+            self.__node_type[cfg_id] = 'cfg'
+            self.__invalidateCache()
             if len(output) != 1:
-                if output[0] not in self.__op_fanout:
-                    self.__op_fanout[output[0]] = output[1:]
-                else:
-                    print("Duplicate driving output")
-            return
+                self.__addFanout(output[0], output[1:])
+            return True
         if (len(inputs) <= 2 and len(config) != 1) or (len(config) != 2**(len(inputs) - 2)):
             print('Configuration string and number of inputs do not match. No node added.')
-            return
-        if cfg_id in self.dGrph:
-            print('cfg_id already exists. No node added.')
-            return
+            return False
         
-        self.dGrph[cfg_id] = [tuple(inputs), [output[0], None], self.__convertToBinaryStr(config)[::-1]]
+        self.dGrph[cfg_id] = [inputs, [output[0], None], int(config, 16), 4*len(config)]
+        self.__cfg_ids.append(cfg_id)
+        self.__node_type[cfg_id] = 'cfg'
+        self.__invalidateCache()
         if len(output) != 1:
-                if output[0] not in self.__op_fanout:
-                    self.__op_fanout[output[0]] = output[1:]
-                else:
-                    print("Duplicate driving output")
+            self.__addFanout(output[0], output[1:])
+        return True
+
+    def __addFanout(self, driver, fanOps):
+        """
+            Records the fan out wires of a driving output.
+
+            Parameters
+            ----------
+            driver : str
+                Identifier of the driving output
+            fanOps : list
+                Identifiers of the fan out wires
+        """
+        if self.__op_fanout.setdefault(driver, fanOps) is not fanOps:
+            print("Duplicate driving output")
     
     def addAriBlck(self, ari_id, inputs, outputs, config):
         """
             Adds a node of type ari_blck to the graph.
-            Note: For faster simulation, the 'config' is stored in the reverse format
-            of what is given as input. But while using function: printAriBlcks(), 
-            the actual 'config' is shown.
+            Note: For faster simulation, the 'config' is stored as an integer, along
+            with its width in bits. listAriBlcks() returns it as a binary string in
+            the reverse format, but printAriBlcks() shows the actual 'config'.
 
 
             Parameters
@@ -212,7 +381,9 @@ class VerilogGraph:
                 to the ari_blck in the sequence: ['A', 'B', 'C', 'D', 'FCI'].
             outputs : set
                 3-sized set of string identifiers representing outputs
-                from the ari_blck in the sequence: ['Y', 'S', 'FCO'].
+                from the ari_blck in the sequence: ['Y', 'S', 'FCO']. An output
+                can also be given as a list, the first element being the driving
+                output and the rest fan out wire identifiers (as in addCfgBlck).
             config : str
                 String of length 5 representing configuration in hexadecimal
                 of the ari_blck.
@@ -221,23 +392,35 @@ class VerilogGraph:
             Example usage
             -------------
             addAriBlck('ariBlck1', ['ipA', 'ipB', 'ipC', 'ipD', 'ipFci'], ['opY', 'opS', 'opFco'], '01d1c')
+
+            Returns
+            -------
+            True if the node was added, False otherwise (the reason is printed).
         """
         # Eliminating basic outlier conditions
         if(len(inputs) != 5):
             print('Invalid number of inputs. No node added.')
-            return
+            return False
         if(len(outputs) != 3):
             print('Invalid number of outputs. No node added.')
-            return
+            return False
         if(len(config) != 5):
             print('Invalid length of configuration string. No node added.')
-            return
-        if ari_id in self.dGrph:
-            print('ari_id already exists. No node added.')
-            return
+            return False
 
-        self.dGrph[ari_id] = [tuple(inputs), [[outputs[0], None], [outputs[1], None], [outputs[2], None]], self.__convertToBinaryStr(config)[::-1]]
-        # print(self.__convertToBinaryStr(config), ari_id)
+        ari_id = intern(ari_id)
+        outputs = [list(map(intern, op)) if type(op) == list else [intern(op)] for op in outputs]
+        node = [tuple(map(intern, inputs)), [[op[0], None] for op in outputs], int(config, 16), 4*len(config)]
+        if self.dGrph.setdefault(ari_id, node) is not node:
+            print('ari_id already exists. No node added.')
+            return False
+        self.__ari_ids.append(ari_id)
+        self.__node_type[ari_id] = 'ari'
+        self.__invalidateCache()
+        for op in outputs:
+            if len(op) != 1:
+                self.__addFanout(op[0], op[1:])
+        return True
 
     def addTribuf(self, tribuf_id, ip, ctrl, op):
         """
@@ -253,13 +436,21 @@ class VerilogGraph:
                 Identifier for the ctrl input to tribuf node.
             output : str
             Identifier for the output to tribuf node.
+
+            Returns
+            -------
+            True if the node was added, False otherwise (the reason is printed).
         """
-        # Eliminating basic outlier conditions
-        if tribuf_id in self.dGrph:
+        tribuf_id, ip, ctrl, op = intern(tribuf_id), intern(ip), intern(ctrl), intern(op)
+
+        node = [(ip, ctrl), [ctrl], [op, None]]
+        if self.dGrph.setdefault(tribuf_id, node) is not node:
             print('tribuf_id already exists. No node added.')
-            return
-            
-        self.dGrph[tribuf_id] = [(ip, ctrl), [ctrl], [op, None]]
+            return False
+        self.__tribuf_ids.append(tribuf_id)
+        self.__node_type[tribuf_id] = 'tribuf'
+        self.__invalidateCache()
+        return True
 
     def __addGate(self, gate_id, gate_type, inputs, output):
         """
@@ -278,19 +469,30 @@ class VerilogGraph:
                 to the gate.
             output : str
                 String identifier of the output of the gate
+
+            Returns
+            -------
+            True if the node was added, False otherwise (the reason is printed).
         """
         # Eliminating basic outlier conditions
         if(gate_type not in ['A', 'O']):
             print('Invalid gate_type. No node added.')
-            return
-        if gate_id in self.dGrph:
-            print('gate_id already exists. No node added.')
-            return
+            return False
         if not len(inputs) >= 2:
             print('Cannot add a gate with less than 2 inputs. No node added.')
-            return
-        
-        self.dGrph[gate_id] = [tuple(inputs), [gate_type, output, None]]
+            return False
+
+        # the input ids are interned by __addVoter(), and tuple() returns a
+        # tuple of inputs as is
+        gate_id = intern(gate_id)
+        node = [tuple(inputs), [gate_type, intern(output), None]]
+        if self.dGrph.setdefault(gate_id, node) is not node:
+            print('gate_id already exists. No node added.')
+            return False
+        self.__gate_ids.append(gate_id)
+        self.__node_type[gate_id] = 'gate'
+        self.__invalidateCache()
+        return True
 
     def triplicateBlck(self, blck_id):
         """
@@ -300,89 +502,83 @@ class VerilogGraph:
             ----------
             blck_id : str
                 String identifier of the blck to triplicate
+
+            Returns
+            -------
+            True if the blck was triplicated, False otherwise (the reason is printed).
         """
         # Eliminating basic outlier conditions
         if blck_id not in self.dGrph:
             print('blck_id: ', blck_id, ' does not exist. Triplication aborted.')
-            return
-
-        # identifying the type of block and triplicating
-        test = len(self.dGrph[blck_id][1])
-        if test == 3:    # ari block
-            ip = self.dGrph[blck_id][0]
-            config = self.dGrph[blck_id][2]
-            new_ids = [blck_id+'_tripd780', blck_id+'_tripd781', blck_id+'_tripd782']
-            new_ops = []
-            for i in range(3):
-                temp_op = []
-                for original_op in self.dGrph[blck_id][1]:
-                    temp_op.append([original_op[0]+'_trip728'+str(i), None])
-                new_ops.append(temp_op)
-
-            self.dGrph[new_ids[0]] = [ip, new_ops[0], config]
-            self.dGrph[new_ids[1]] = [ip, new_ops[1], config]
-            self.dGrph[new_ids[2]] = [ip, new_ops[2], config]
-
-            # for first output
-            self.__addGate(new_ids[0]+'_and0', 'A', [new_ops[0][0][0], new_ops[1][0][0]], new_ids[0]+'_and0_o')
-            self.__addGate(new_ids[1]+'_and0', 'A', [new_ops[0][0][0], new_ops[2][0][0]], new_ids[1]+'_and0_o')
-            self.__addGate(new_ids[2]+'_and0', 'A', [new_ops[1][0][0], new_ops[2][0][0]], new_ids[2]+'_and0_o')
-
-            self.__addGate(new_ids[0]+'_or0', 'O', [new_ids[0]+'_and0_o', new_ids[1]+'_and0_o', new_ids[2]+'_and0_o'], self.dGrph[blck_id][1][0][0])
-
-            # for second output
-            self.__addGate(new_ids[0]+'_and1', 'A', [new_ops[0][1][0], new_ops[1][1][0]], new_ids[0]+'_and1_o')
-            self.__addGate(new_ids[1]+'_and1', 'A', [new_ops[0][1][0], new_ops[2][1][0]], new_ids[1]+'_and1_o')
-            self.__addGate(new_ids[2]+'_and1', 'A', [new_ops[1][1][0], new_ops[2][1][0]], new_ids[2]+'_and1_o')
-
-            self.__addGate(new_ids[0]+'_or1', 'O', [new_ids[0]+'_and1_o', new_ids[1]+'_and1_o', new_ids[2]+'_and1_o'], self.dGrph[blck_id][1][1][0])
-
-            # for third output
-            self.__addGate(new_ids[0]+'_and2', 'A', [new_ops[0][2][0], new_ops[1][2][0]], new_ids[0]+'_and2_o')
-            self.__addGate(new_ids[1]+'_and2', 'A', [new_ops[0][2][0], new_ops[2][2][0]], new_ids[1]+'_and2_o')
-            self.__addGate(new_ids[2]+'_and2', 'A', [new_ops[1][2][0], new_ops[2][2][0]], new_ids[2]+'_and2_o')
-
-            self.__addGate(new_ids[0]+'_or2', 'O', [new_ids[0]+'_and2_o', new_ids[1]+'_and2_o', new_ids[2]+'_and2_o'], self.dGrph[blck_id][1][2][0])
-
-            del self.dGrph[blck_id]
-
-        elif test == 2:  # cfg block
-            ip = self.dGrph[blck_id][0]
-            config = self.dGrph[blck_id][2]
-            new_ids = [blck_id+'_tripd780', blck_id+'_tripd781', blck_id+'_tripd782']
-            new_ops =  [[self.dGrph[blck_id][2][0] + '_trip7280', None], [self.dGrph[blck_id][2][0] + '_trip7281', None], [self.dGrph[blck_id][2][0] + '_trip7282', None]]
-
-            self.dGrph[new_ids[0]] = [ip, new_ops[0], config]
-            self.dGrph[new_ids[1]] = [ip, new_ops[1], config]
-            self.dGrph[new_ids[2]] = [ip, new_ops[2], config]
-
-            self.__addGate(new_ids[0]+'_and0', 'A', [new_ops[0][0], new_ops[1][0]], new_ids[0]+'_and0_o')
-            self.__addGate(new_ids[1]+'_and0', 'A', [new_ops[0][0], new_ops[2][0]], new_ids[1]+'_and0_o')
-            self.__addGate(new_ids[2]+'_and0', 'A', [new_ops[1][0], new_ops[2][0]], new_ids[2]+'_and0_o')
-
-            self.__addGate(new_ids[0]+'_or0', 'O', [new_ids[0]+'_and0_o', new_ids[1]+'_and0_o', new_ids[2]+'_and0_o'], self.dGrph[blck_id][1][0])
-
-            del self.dGrph[blck_id]
-
-        elif test == 1:  # tribuf
-            ip = self.dGrph[blck_id][0]
-            new_ids = [blck_id+'_tripd780', blck_id+'_tripd781', blck_id+'_tripd782']
-            new_ops =  [[self.dGrph[blck_id][2][0] + '_trip7280', None], [self.dGrph[blck_id][2][0] + '_trip7281', None], [self.dGrph[blck_id][2][0] + '_trip7282', None]]
-
-            self.dGrph[new_ids[0]] = [ip, [ip[1]], new_ops[0]]
-            self.dGrph[new_ids[1]] = [ip, [ip[1]], new_ops[1]]
-            self.dGrph[new_ids[2]] = [ip, [ip[1]], new_ops[2]]
+            return False
 
-            self.__addGate(new_ids[0]+'_and0', 'A', [new_ops[0][0], new_ops[1][0]], new_ids[0]+'_and0_o')
-            self.__addGate(new_ids[1]+'_and0', 'A', [new_ops[0][0], new_ops[2][0]], new_ids[1]+'_and0_o')
-            self.__addGate(new_ids[2]+'_and0', 'A', [new_ops[1][0], new_ops[2][0]], new_ids[2]+'_and0_o')
+        # identifying the type of block
+        test = self.__node_type[blck_id]
+        if test not in ['ari', 'cfg', 'tribuf']:
+            print('Unknown error!!!!!!\n')
+            return False
+        kind_ids = {'ari': self.__ari_ids, 'cfg': self.__cfg_ids, 'tribuf': self.__tribuf_ids}[test]
+
+        # outputs of the blck, each driven by a voter afterwards
+        dGrph = self.dGrph
+        node = dGrph[blck_id]
+        ip = node[0]
+        if test == 'ari':
+            ops = [op[0] for op in node[1]]
+        elif test == 'cfg':
+            ops = [node[1][0]]
+        else:
+            ops = [node[2][0]]
+
+        # triplicating
+        new_ids = [intern(blck_id + _TRIP_BLCK_SUFFIX + str(i)) for i in range(3)]
+        new_ops = [[intern(op + _TRIP_OP_SUFFIX + str(i)) for op in ops] for i in range(3)]
+        for new_id, trip_ops in zip(new_ids, new_ops):
+            # the input tuple and the config are shared by the copies, each
+            # copy only owns its outputs
+            if test == 'ari':
+                dGrph[new_id] = [ip, [[op, None] for op in trip_ops], node[2], node[3]]
+            elif test == 'cfg':
+                dGrph[new_id] = [ip, [trip_ops[0], None], node[2], node[3]]
+            else:
+                dGrph[new_id] = [ip, [ip[1]], [trip_ops[0], None]]
+        kind_ids.extend(new_ids)
+        self.__node_type.update(dict.fromkeys(new_ids, test))
+
+        # voting on every output
+        for k, op in enumerate(ops):
+            self.__addVoter(new_ids, [trip_ops[k] for trip_ops in new_ops], op, k)
+
+        del dGrph[blck_id]
+        kind_ids.remove(blck_id)
+        del self.__node_type[blck_id]
+        self.__invalidateCache()
+        return True
 
-            self.__addGate(new_ids[0]+'_or0', 'O', [new_ids[0]+'_and0_o', new_ids[1]+'_and0_o', new_ids[2]+'_and0_o'], self.dGrph[blck_id][1][0])
+    def __addVoter(self, new_ids, trip_ops, op, k):
+        """
+            Adds the majority voter of the k-th output of a triplicated blck:
+            an and_gate on every pair of the triplicated outputs, and an
+            or_gate on the three and_gates.
 
-            del self.dGrph[blck_id]
-        
-        else:
-            print('Unknown error!!!!!!\n')
+            Parameters
+            ----------
+            new_ids : list
+                Identifiers of the three triplicated blcks
+            trip_ops : list
+                Identifiers of the k-th output of each triplicated blck
+            op : str
+                Identifier of the output of the or_gate
+            k : int
+                Index of the output in the blck
+        """
+        addGate = self.__addGate
+        suffix = '_and' + str(k)
+        and_ops = tuple(intern(new_id + suffix + '_o') for new_id in new_ids)
+        a0, a1, a2 = trip_ops
+        for new_id, and_op, pair in zip(new_ids, and_ops, ((a0, a1), (a0, a2), (a1, a2))):
+            addGate(new_id + suffix, 'A', pair, and_op)
+        addGate(new_ids[0] + '_or' + str(k), 'O', and_ops, op)
             
     def listPrimeIos(self, show_bit_value = False):
         """
@@ -395,16 +591,14 @@ class VerilogGraph:
             default: List of tuples in format (prime_io-node-IDs, io_type).
             if show_bit_value is True: List of tuples in format (prime_io-node-IDs, io_type, [1 | 0 | Z]).
         """
-        lst = []
-        for key in self.dGrph:
-            if len(self.dGrph[key]) == 2:
-                # eliminating gate-nodes
-                if len(self.dGrph[key][0]) == 1:
-                    if show_bit_value:
-                        lst.append((key, self.dGrph[key][0], self.dGrph[key][1]))
-                    else:
-                        lst.append((key, self.dGrph[key][0]))
-        return lst
+        if self.__cache_prime_ios is None:
+            dGrph = self.dGrph
+            self.__cache_prime_ios = [(key, dGrph[key][0]) for key in self.__prime_io_ids]
+
+        if show_bit_value:
+            dGrph = self.dGrph
+            return [(key, io_type, dGrph[key][1]) for key, io_type in self.__cache_prime_ios]
+        return list(self.__cache_prime_ios)
 
     def printPrimeIos(self, show_bit_value = False):
         """
@@ -438,17 +632,18 @@ class VerilogGraph:
             if show_bit_value is True: List of tuples in format
                 (cfg_blck-node-IDs, cfg-string, tuple-of-ips, (output_id, [1 | 0])).
         """
-        lst = []
-        for key in self.dGrph:
-            # eliminating prime_ios node
-            if len(self.dGrph[key]) != 2:
-                # eliminating other node
-                if len(self.dGrph[key][1]) == 2:
-                    if show_bit_value:
-                        lst.append((key, self.dGrph[key][2], self.dGrph[key][0], self.dGrph[key][1]))
-                    else:
-                        lst.append((key, self.dGrph[key][2], self.dGrph[key][0], (self.dGrph[key][1][0])))                        
-        return lst
+        if self.__cache_cfg is None:
+            lst = []
+            for key in self.__cfg_ids:
+                node = self.dGrph[key]
+                cfg_str = _reversedBinaryStr(node[2], node[3])
+                lst.append((key, cfg_str, node[0], (node[1][0])))
+            self.__cache_cfg = lst
+
+        if show_bit_value:
+            dGrph = self.dGrph
+            return [(key, cfg, ips, dGrph[key][1]) for key, cfg, ips, _ in self.__cache_cfg]
+        return list(self.__cache_cfg)
 
     def printCfgBlcks(self, show_bit_value = False):
         """
@@ -486,17 +681,18 @@ class VerilogGraph:
             if show_bit_value is True: List of tuples in format
                 (ari_blck-node-IDs, cfg-string, tuple-of-ips, [[op1, [1 | 0]], ...]).
         """
-        lst = []
-        for key in self.dGrph:
-            # eliminating prime_ios node
-            if len(self.dGrph[key]) != 2:
-                # eliminating pther nodes
-                if len(self.dGrph[key][1]) == 3:
-                    if show_bit_value:
-                        lst.append((key, self.dGrph[key][2], self.dGrph[key][0], self.dGrph[key][1]))
-                    else:
-                        lst.append((key, self.dGrph[key][2], self.dGrph[key][0], [op for op in self.dGrph[key][1]]))
-        return lst
+        if self.__cache_ari is None:
+            lst = []
+            for key in self.__ari_ids:
+                node = self.dGrph[key]
+                cfg_str = _reversedBinaryStr(node[2], node[3])
+                lst.append((key, cfg_str, node[0], list(node[1])))
+            self.__cache_ari = lst
+
+        if show_bit_value:
+            dGrph = self.dGrph
+            return [(key, cfg, ips, dGrph[key][1]) for key, cfg, ips, _ in self.__cache_ari]
+        return list(self.__cache_ari)
 
     def printAriBlcks(self, show_bit_value = False):
         """
@@ -533,17 +729,14 @@ class VerilogGraph:
             if show_bit_value is True: List of tuples in format
                 (tribuf-node-IDs, tuple-of-ips, (output_id, 1|0|Z)).
         """
-        lst = []
-        for key in self.dGrph:
-            # eliminating prime_ios node
-            if len(self.dGrph[key]) != 2:
-                # eliminating other blcks 
-                if len(self.dGrph[key][1]) == 1:
-                    if show_bit_value:
-                        lst.append((key, self.dGrph[key][0], self.dGrph[key][2])) 
-                    else:
-                        lst.append((key, self.dGrph[key][0], self.dGrph[key][2][0]))                        
-        return lst
+        if self.__cache_tribuf is None:
+            dGrph = self.dGrph
+            self.__cache_tribuf = [(key, dGrph[key][0], dGrph[key][2][0]) for key in self.__tribuf_ids]
+
+        if show_bit_value:
+            dGrph = self.dGrph
+            return [(key, ips, dGrph[key][2]) for key, ips, _ in self.__cache_tribuf]
+        return list(self.__cache_tribuf)
 
     def printTribufs(self, show_bit_value = False):
         """
@@ -575,16 +768,15 @@ class VerilogGraph:
             default: List of tuples in format (gate-ID, gate_type, gate-inputs, gate-output).
             if show_bit_value is True: List of tuples in format (gate-ID, gate_type, gate-inputs, gate-output, output-value: [1|0|Z]).
         """
-        lst = []
-        for key in self.dGrph:
-            if len(self.dGrph[key]) == 2:
-                # eliminating primeIo node
-                if len(self.dGrph[key][0]) >= 2:
-                    if show_bit_value:
-                        lst.append((key, self.dGrph[key][1][0], self.dGrph[key][0], self.dGrph[key][1][1], self.dGrph[key][1][2]))
-                    else:
-                        lst.append((key, self.dGrph[key][1][0], self.dGrph[key][0], self.dGrph[key][1][1]))
-        return lst
+        if self.__cache_gate is None:
+            dGrph = self.dGrph
+            self.__cache_gate = [(key, dGrph[key][1][0], dGrph[key][0], dGrph[key][1][1])
+                                 for key in self.__gate_ids]
+
+        if show_bit_value:
+            dGrph = self.dGrph
+            return [(key, gate_type, ips, op, dGrph[key][1][2]) for key, gate_type, ips, op in self.__cache_gate]
+        return list(self.__cache_gate)
 
     def printGates(self, show_bit_value = False):
         """
@@ -619,8 +811,11 @@ class VerilogGraph:
             if show_bit_value is True: List of tuples in format
                 (inter_op, blck_of_origin, [1|0|Z]).
         """
+        if not show_bit_value and self.__cache_inter is not None:
+            return list(self.__cache_inter)
+
         lst = []
-        prime_ips = [io[0] for io in self.listPrimeIos() if io[1] == 'i']
+        prime_ips = self.__prime_ip_set
 
         # obtaining intermediate outputs of each configuration block
         cfg_blcks = self.listCfgBlcks(show_bit_value)
@@ -659,6 +854,9 @@ class VerilogGraph:
                 else:
                     lst.append((gate[3], gate[0]))
 
+        if not show_bit_value:
+            self.__cache_inter = lst
+            return list(lst)
         return lst
 
     def setIpValue(self, ip_id, value):
@@ -674,333 +872,576 @@ class VerilogGraph:
             value : int [1|0]
                 Value of the node
         """ 
-        v = value
         # Eliminating basic outliers
         if ip_id not in self.dGrph:
             print(ip_id, ' does not exist in graph. Value not set.')
             return
-        if ip_id in self.dGrph:
-            if self.dGrph[ip_id][0] != 'i':
-                print('Cannot set value of any other node. Value not set.')
-                return
-        
-        if value >= 1:
-            v = 1
-        else:
-            v = 0
+        if self.dGrph[ip_id][0] != 'i':
+            print('Cannot set value of any other node. Value not set.')
+            return
         
-        self.dGrph[ip_id][1] = v
+        self.dGrph[ip_id][1] = int(value >= 1)
     
     def setRandomInputs(self):
         """
             Sets random input values to all the primary inputs
         """
-        prime_ips = [io[0] for io in self.listPrimeIos() if (io[1] == 'i' and (io[0] not in ['VCC', 'GND']))]
-        bit_str = self.__randomStringGen(len(prime_ips))
+        prime_ips = [ip for ip in self.__prime_ip if ip != 'VCC' and ip != 'GND']
+        # one random bit per input, drawn at once
+        bits = random.getrandbits(len(prime_ips)) if prime_ips else 0
 
+        dGrph = self.dGrph
         for idx, ip in enumerate(prime_ips):
-            self.dGrph[ip][1] = int(bit_str[idx])
+            dGrph[ip][1] = (bits >> idx) & 1
 
-    def __charToBool(self, char):
+    def __simSetup(self):
+        """
+            Performs pre-requisites before simulation.
         """
-            Converts '1' to True and '0' to False
+        # (list, index) of every output value in dGrph, i.e. of the primary
+        # outputs and of the outputs of all blcks
+        if self.__sim_reset is None:
+            dGrph = self.dGrph
+            reset = [(dGrph[prime_op], 1) for prime_op in self.__prime_op]
+            reset.extend((dGrph[cfg_id][1], 1) for cfg_id in self.__cfg_ids)
+            for ari_id in self.__ari_ids:
+                reset.extend((op, 1) for op in dGrph[ari_id][1])
+            reset.extend((dGrph[tri_id][2], 1) for tri_id in self.__tribuf_ids)
+            reset.extend((dGrph[gate_id][1], 2) for gate_id in self.__gate_ids)
+            self.__sim_reset = reset
+
+        # setting all output values to None
+        for holder, i in self.__sim_reset:
+            holder[i] = None
+
+    def __buildTopoOrder(self):
+        """
+            Orders the blcks (cfg, ari, tribuf and gate) such that every blck
+            comes after the blcks driving its inputs (Kahn's algorithm). The
+            order only depends on the structure of the graph, hence it is
+            cached until the graph is modified.
 
-            Parameters
-            ----------
-            char : str
-                Either '1' or '0'
-            
             Returns
             -------
-            True, if char == '1' ; False, if char == '0'
+            List of blck IDs in evaluation order. Blcks on a combinational
+            loop are left out.
         """
-
-        if char == '1':
-            return True
-        elif char == '0':
-            return False
-    
-    def __boolToChar(self, boolean):
+        if self.__topo_order is not None:
+            return self.__topo_order
+
+        prime_ips = self.__prime_ip_set
+        blck_ids = self.__cfg_ids + self.__ari_ids + self.__tribuf_ids + self.__gate_ids
+
+        # output_id -> blck driving it (the first one listed, as in simulate())
+        producers = {}
+        for blck_id in blck_ids:
+            for op_id, _ in self.__blckOps(blck_id):
+                if op_id not in prime_ips and op_id not in producers:
+                    producers[op_id] = blck_id
+
+        in_degree = {blck_id: 0 for blck_id in blck_ids}
+        successors = {blck_id: [] for blck_id in blck_ids}
+        for blck_id in blck_ids:
+            for ip in self.dGrph[blck_id][0]:
+                if ip in producers:
+                    successors[producers[ip]].append(blck_id)
+                    in_degree[blck_id] += 1
+
+        order = []
+        queue = deque([blck_id for blck_id in blck_ids if in_degree[blck_id] == 0])
+        while queue:
+            blck_id = queue.popleft()
+            order.append(blck_id)
+            for nxt in successors[blck_id]:
+                in_degree[nxt] -= 1
+                if in_degree[nxt] == 0:
+                    queue.append(nxt)
+
+        self.__topo_order = order
+        return order
+
+    def __buildKernel(self):
         """
-            Converts True to '1' and False to '0'
+            Assigns every primary input and intermediate output a dense
+            integer slot, and compiles the blcks, in topological order, into
+            a flat program over these slots which __runKernel() can evaluate
+            without dispatching on the type of every blck.
+            Also resolves the primary output nodes which the blcks write
+            through to (__op_writeback, __fanout_writeback).
+            Cached until the graph is modified.
 
-            Parameters
-            ----------
-            boolean : bool
-            
             Returns
             -------
-            '1', if boolean == True ; '0', if boolean == False
-        """
-
-        if boolean:
-            return '1'
-        else:
-            return '0'
-
-    def __simSetup(self):
+            Tuple in format (io_slot, io_src, program, left_over), where
+                io_slot : dictionary mapping io_id -> slot
+                io_src : list of io_source per slot ('$' for primary inputs,
+                    else the blck of origin; the first one listed wins)
+                program : list of tuples in format
+                    (blck_id, out, vi, ip_slots, pack, is_ari, owned_ops, table, targets),
+                    ip_slots being None if any of the inputs has no slot, pack
+                    the function packing the inputs (see _ipPacker()), and
+                    owned_ops the (slot, output index) pairs of the outputs
+                    sourced by the blck.
+                    For ari blcks, out is the list of [output, value] pairs,
+                    table holds the outputs (Y, S, FCO) for the inputs packed
+                    as i, and targets the (output index, primary output node)
+                    pairs.
+                    For the other blcks, out[vi] is the value of the output,
+                    table holds the output for the inputs packed as i, and
+                    targets the primary output nodes the output is written
+                    through to (None for a fan out wire which is not a primary
+                    output).
+                left_over : list of the blck IDs left out of the topological
+                    order, i.e. on a combinational loop or reading a blck on one
         """
-            Performs pre-requisites before simulation.
+        if self.__kernel is not None:
+            return self.__kernel
+
+        io_slot = {}
+        io_src = []
+        for ip in self.__prime_ip:
+            io_slot[ip] = len(io_src)
+            io_src.append('$')
+        for io in self.listIntermediateOps(True):
+            if io[0] not in io_slot:
+                io_slot[io[0]] = len(io_src)
+                io_src.append(io[1])
+
+        # output_id -> primary output node, and driving output_id -> fan out
+        # nodes (None for a fan out wire which is not a primary output)
+        self.__op_writeback = {op: self.dGrph[op] for op in self.__prime_op}
+        self.__fanout_writeback = {
+            op: [self.dGrph[fanOp] if fanOp in self.__prime_op_set else None for fanOp in fanOps]
+            for op, fanOps in self.__op_fanout.items()
+        }
+
+        program = []
+        order = self.__buildTopoOrder()
+        for blck_id in order:
+            node = self.dGrph[blck_id]
+            test = self.__node_type[blck_id]
+            ip_slots = tuple(io_slot.get(ip) for ip in node[0])
+            if None in ip_slots:
+                ip_slots = None
+            n_ips = len(node[0])
+            owned_ops = [(io_slot[op_id], k) for k, (op_id, _) in enumerate(self.__blckOps(blck_id))
+                         if op_id in io_slot and io_src[io_slot[op_id]] == blck_id]
+
+            if test == 'ari':
+                # outputs (Y, S, FCO) for each of the 32 input combinations,
+                # and (output index, node) for the outputs written through
+                out, vi = node[1], None
+                table = tuple(self.__evalAri(node[2], i) for i in range(32))
+                targets = [(k, self.__op_writeback[op[0]]) for k, op in enumerate(node[1])
+                           if op[0] in self.__op_writeback]
+                targets += [(k, fan_node) for k, op in enumerate(node[1])
+                            for fan_node in self.__fanout_writeback.get(op[0], ())]
+            else:
+                if test == 'cfg':
+                    # truth table with one byte per entry
+                    out, vi, op_id = node[1], 1, node[1][0]
+                    table = bytes((node[2] >> i) & 1 for i in range(1 << n_ips))
+                elif test == 'tribuf':
+                    # inputs packed as 0b(input)(ctrl), Z unless ctrl is 1
+                    out, vi, op_id = node[2], 1, node[2][0]
+                    table = ('Z', 0, 'Z', 1)
+                else:
+                    # 1 when all (and_gate) or any (or_gate) of the inputs are 1
+                    out, vi, op_id = node[1], 2, node[1][1]
+                    if node[1][0] == 'A':
+                        table = bytes(int(i == (1 << n_ips) - 1) for i in range(1 << n_ips))
+                    else:
+                        table = bytes(int(i != 0) for i in range(1 << n_ips))
+                # the nodes the output is written through to
+                targets = []
+                if op_id in self.__op_writeback:
+                    targets.append(self.__op_writeback[op_id])
+                if test == 'cfg':
+                    targets.extend(self.__fanout_writeback.get(op_id, []))
+            pack = _ipPacker(n_ips)
+            program.append((blck_id, out, vi, ip_slots, pack, test == 'ari', owned_ops, table, targets))
+
+        in_order = set(order)
+        left_over = [blck_id for blck_id in self.__cfg_ids + self.__ari_ids + self.__tribuf_ids + self.__gate_ids
+                     if blck_id not in in_order]
+
+        self.__kernel = (io_slot, io_src, program, left_over)
+        return self.__kernel
+
+    def __runKernel(self, values):
         """
-        self.__prime_ip = [(io[0], '$', io[2]) for io in self.listPrimeIos(True) if io[1] == 'i']
+            Evaluates the program built by __buildKernel(). Blcks of the
+            program whose inputs are not all available (an unknown input or a
+            primary input which is not set) are handed over to __processBlcks(),
+            and the blcks it processes on the way are skipped when reached.
+            The blcks left out of the program (on or behind a combinational
+            loop) are then handed over to __processBlcks() as well, which
+            reports the loop.
 
-        # setting primary output values to None
-        for prime_op in self.__prime_op:
-            self.dGrph[prime_op][1] = None
-
-        # setting cfg_blck output values to None
-        blck_ids = [blck[0] for blck in self.listCfgBlcks()]
-        for cfg_id in blck_ids:
-            self.dGrph[cfg_id][1][1] = None
-        
-        # setting ari_blck output values to None
-        blck_ids = [blck[0] for blck in self.listAriBlcks()]
-        for ari_id in blck_ids:
-            self.dGrph[ari_id][1][0][1] =  None
-            self.dGrph[ari_id][1][1][1] =  None
-            self.dGrph[ari_id][1][2][1] =  None
-        
-        # setting tribuf output values to None
-        blck_ids = [blck[0] for blck in self.listTribufs()]
-        for tri_id in blck_ids:
-            self.dGrph[tri_id][2][1] = None
-        
-        # setting gate output values to None
-        blck_ids = [blck[0] for blck in self.listGates()]
-        for gate_id in blck_ids:
-            self.dGrph[gate_id][1][2] = None
+            Parameters
+            ----------
+            values : list
+                Same as in __processBlcks()
+        """
+        verbose = self.verbose
+        # set once __processBlcks() has run, as it may process blcks further
+        # down the program to get the inputs
+        fell_back = False
+        _, _, program, left_over = self.__buildKernel()
+        for blck_id, out, vi, ip_slots, pack, is_ari, owned_ops, table, targets in program:
+            if fell_back and owned_ops and values[owned_ops[0][0]] is not None:
+                # already processed
+                continue
+            if ip_slots is not None:
+                ip_int = pack(values, ip_slots)
+                if ip_int != -1:
+                    # same as the __process* functions, with the truth tables
+                    # and write through targets resolved beforehand
+                    if is_ari:
+                        if ip_int is None:
+                            out[0][1] = out[1][1] = out[2][1] = 'Z'
+                        else:
+                            out[0][1], out[1][1], out[2][1] = table[ip_int]
+                        for k, target in targets:
+                            if target is not None:
+                                target[1] = out[k][1]
+                            else:
+                                print("Sanity check failed.")
+                        for slot, k in owned_ops:
+                            values[slot] = out[k][1]
+                    else:
+                        value = 'Z' if ip_int is None else table[ip_int]
+                        out[vi] = value
+                        for target in targets:
+                            if target is not None:
+                                target[1] = value
+                            else:
+                                print("Sanity check failed.")
+                        for slot, _ in owned_ops:
+                            values[slot] = value
+                    if verbose:
+                        print('Processed blck: ', blck_id)
+                    continue
+
+            fell_back = True
+            if(self.__processBlcks(blck_id, values)):
+                if verbose:
+                    print('Processed blck: ', blck_id)
+            else:
+                print('Some error in processing blck: ', blck_id)
+
+        for blck_id in left_over:
+            if self.__blckOps(blck_id)[0][1] is not None:
+                # already processed
+                continue
+            if(self.__processBlcks(blck_id, values)):
+                if verbose:
+                    print('Processed blck: ', blck_id)
+            else:
+                print('Some error in processing blck: ', blck_id)
 
-    def __processCfgBlck(self, blck_id, ip_str):
+    def __processCfgBlck(self, node, ip_int):
         """
             Processes the CFG blocks and sets the values of each output node.
             Note: This function should only be called from __processBlcks()
 
             Parameters
             ----------
-            blck_id : str
-                Identifier of the block
-            ip_str : str
-                String of input values
+            node : list
+                Node of the block in dGrph
+            ip_int : int
+                Input values packed into an integer, the first input being the
+                most significant bit. None if any of the inputs is in Z state.
         """
-        # Outlier check for Z state in input string
-        if 'Z' in ip_str:
-            self.dGrph[blck_id][1][1] = 'Z'
+        op = node[1]
+
+        # Outlier check for Z state in inputs
+        if ip_int is None:
+            op[1] = 'Z'
         else:
-            if len(ip_str) == 1:
-                self.dGrph[blck_id][1][1] = int(ip_str, 2)
-            else:
-                self.dGrph[blck_id][1][1] = self.dGrph[blck_id][2][int(ip_str, 2)]
+            op[1] = (node[2] >> ip_int) & 1
 
         # update primary output if current block's output is primary output
-        if self.dGrph[blck_id][1][0] in self.__prime_op:
-            self.dGrph[self.dGrph[blck_id][1][0]][1] = self.dGrph[blck_id][1][1]
+        prime_node = self.__op_writeback.get(op[0])
+        if prime_node is not None:
+            prime_node[1] = op[1]
         
         # update fan out outputs
-        if self.dGrph[blck_id][1][0] in self.__op_fanout:
-            for fanOp in self.__op_fanout[self.dGrph[blck_id][1][0]]:
-                # sanity check
-                if fanOp in self.__prime_op:
-                    self.dGrph[fanOp][1] = self.dGrph[blck_id][1][1]
-                else:
-                    print("Sanity check failed.")
+        for fan_node in self.__fanout_writeback.get(op[0], ()):
+            # sanity check
+            if fan_node is not None:
+                fan_node[1] = op[1]
+            else:
+                print("Sanity check failed.")
+
+    def __evalAri(self, INIT, ip_int):
+        """
+            Calculates the outputs of an ari blck.
 
-    def __processAriBlck(self, blck_id, ip_str):
+            Parameters
+            ----------
+            INIT : int
+                Configuration of the blck as integer
+            ip_int : int
+                Input values packed into an integer as 0bABCD(FCI).
+
+            Returns
+            -------
+            Tuple of output values (Y, S, FCO).
+        """
+        # temp input variables to the block
+        ABCD = ip_int >> 1
+        FCI = ip_int & 1
+        INIT16 = (INIT >> 16) & 1
+        INIT17 = (INIT >> 17) & 1
+        INIT18 = (INIT >> 18) & 1
+        INIT19 = (INIT >> 19) & 1
+
+        # intermediataries for calculating output
+        F0 = (INIT >> (ABCD & 7)) & 1
+        F1 = (INIT >> (8 | (ABCD & 7))) & 1
+        P = INIT19 | ((1 ^ INIT19) & INIT18)
+        G = (F0 & INIT16 & INIT17) | (INIT17 & (1 ^ INIT16)) | (F1 & INIT16 & INIT17)
+
+        # outputs
+        Y = (INIT >> ABCD) & 1
+        S = Y ^ FCI
+        FCO = ((1 ^ P) & G) | (P & FCI)
+        return Y, S, FCO
+
+    def __processAriBlck(self, node, ip_int):
         """
             Processes the ARI blocks and sets the values of each output node.
             Note: This function should only be called from __processBlcks()
 
             Parameters
             ----------
-            blck_id : str
-                Identifier of the block
-            ip_str : str
-                String of input values
-        """
-        # Outlier check for Z state in input string
-        if 'Z' in ip_str:
-            self.dGrph[blck_id][1][0][1] = 'Z'
-            self.dGrph[blck_id][1][1][1] = 'Z'
-            self.dGrph[blck_id][1][2][1] = 'Z'
+            node : list
+                Node of the block in dGrph
+            ip_int : int
+                Input values packed into an integer as 0bABCD(FCI). None if any
+                of the inputs is in Z state.
+        """
+        # Outlier check for Z state in inputs
+        if ip_int is None:
+            node[1][0][1] = 'Z'
+            node[1][1][1] = 'Z'
+            node[1][2][1] = 'Z'
         else:
-            # temp input variables to the block
-            A = ip_str[0]
-            B = ip_str[1]
-            C = ip_str[2]
-            D = ip_str[3]
-            FCI = self.__charToBool(ip_str[4])
-            INIT = self.dGrph[blck_id][2]   # config bit string
-            INIT16 = self.__charToBool(INIT[16])
-            INIT17 = self.__charToBool(INIT[17])
-
-            # intermediataries for calculating output
-            F0 = self.__charToBool(INIT[int('0' + B + C + D, 2)])
-            F1 = self.__charToBool(INIT[int('1' + B + C + D, 2)])
-            P = self.__charToBool(INIT[19]) | (~self.__charToBool(INIT[19]) & self.__charToBool(INIT[18]))
-            G = (F0 & INIT16 & INIT17) | (INIT17 & ~INIT16) | (F1 & INIT16 & INIT17)
-
-            # outputs
-            Y = self.__charToBool(INIT[int(A + B + C + D, 2)])
-            S = Y ^ FCI
-            FCO = (~P & G) | (P & FCI)
-            self.dGrph[blck_id][1][0][1] = self.__boolToChar(Y)
-            self.dGrph[blck_id][1][1][1] = self.__boolToChar(S)
-            self.dGrph[blck_id][1][2][1] = self.__boolToChar(FCO)
+            Y, S, FCO = self.__evalAri(node[2], ip_int)
+            node[1][0][1] = Y
+            node[1][1][1] = S
+            node[1][2][1] = FCO
 
         # update primary output if current block's output is primary output
-        if self.dGrph[blck_id][1][0][0] in self.__prime_op:
-            self.dGrph[self.dGrph[blck_id][1][0][0]][1] = self.dGrph[blck_id][1][0][1]
-        
-        if self.dGrph[blck_id][1][1][0] in self.__prime_op:
-            self.dGrph[self.dGrph[blck_id][1][1][0]][1] = self.dGrph[blck_id][1][1][1]
-        
-        if self.dGrph[blck_id][1][2][0] in self.__prime_op:
-            self.dGrph[self.dGrph[blck_id][1][2][0]][1] = self.dGrph[blck_id][1][2][1]
+        for op in node[1]:
+            prime_node = self.__op_writeback.get(op[0])
+            if prime_node is not None:
+                prime_node[1] = op[1]
 
-        pass  
+            # update fan out outputs
+            for fan_node in self.__fanout_writeback.get(op[0], ()):
+                # sanity check
+                if fan_node is not None:
+                    fan_node[1] = op[1]
+                else:
+                    print("Sanity check failed.")
     
-    def __processTribuf(self, blck_id, ip_str):
+    def __processTribuf(self, node, ip_int):
         """
             Processes the tribuf blocks and sets the values of each output node.
             Note: This function should only be called from __processBlcks()
 
             Parameters
             ----------
-            blck_id : str
-                Identifier of the block
-            ip_str : str
-                String of input values
+            node : list
+                Node of the block in dGrph
+            ip_int : int
+                Input values packed into an integer as 0b(input)(ctrl). None if
+                any of the inputs is in Z state.
         """
-        if ip_str[1] == '1':
-            self.dGrph[blck_id][2][1] = ip_str[0]
+        if ip_int is not None and ip_int & 1:
+            node[2][1] = ip_int >> 1
         else:
-            self.dGrph[blck_id][2][1] = 'Z'
+            node[2][1] = 'Z'
         
         # update primary output if current block's output is primary output
-        if self.dGrph[blck_id][2][0] in self.__prime_op:
-            self.dGrph[self.dGrph[blck_id][2][0]][1] = self.dGrph[blck_id][2][1]
+        prime_node = self.__op_writeback.get(node[2][0])
+        if prime_node is not None:
+            prime_node[1] = node[2][1]
 
-    def __processGates(self, blck_id, ip_str):
+    def __processGates(self, node, ip_int):
         """
             Processes the gate blocks and sets the values of each output node.
             Note: This function should only be called from __processBlcks()
 
             Parameters
             ----------
-            blck_id : str
-                Identifier of the block
-            ip_str : str
-                String of input values
+            node : list
+                Node of the block in dGrph
+            ip_int : int
+                Input values packed into an integer. None if any of the inputs
+                is in Z state.
         """
-        # Outlier check for Z state in input string
-        if 'Z' in ip_str:
-            self.dGrph[blck_id][1][2] = 'Z'
-        else:
-            # converting input bit stream to boolean variables for processing
-            ip_bool = []
-            for ip in ip_str:
-                ip_bool.append(self.__charToBool(ip))
-
-            if self.dGrph[blck_id][1][0] == 'A':
-                output = True
-                for x in ip_bool:
-                    output = output and x
-                self.dGrph[blck_id][1][2] = self.__boolToChar(output)
-            elif self.dGrph[blck_id][1][0] == 'O':
-                output = False
-                for x in ip_bool:
-                    output = output or x
-                self.dGrph[blck_id][1][2] = self.__boolToChar(output)
+        # Outlier check for Z state in inputs
+        if ip_int is None:
+            node[1][2] = 'Z'
+        elif node[1][0] == 'A':
+            # all the inputs are 1
+            node[1][2] = int(ip_int == (1 << len(node[0])) - 1)
+        elif node[1][0] == 'O':
+            # any of the inputs is 1
+            node[1][2] = int(ip_int != 0)
 
         # update primary output if current block's output is primary output
-        if self.dGrph[blck_id][1][1] in self.__prime_op:
-            self.dGrph[self.dGrph[blck_id][1][1]][1] = self.dGrph[blck_id][1][2]
+        prime_node = self.__op_writeback.get(node[1][1])
+        if prime_node is not None:
+            prime_node[1] = node[1][2]
 
-    def __processBlcks(self, blck_id):
+    def __blckOps(self, blck_id):
         """
-            Processes the blocks and sets the values of each output node.
-            Note: Should only be called by from simulate function and/or recursively.
+            Returns the outputs of a block along with their current values.
 
             Parameters
             ----------
             blck_id : str
                 Identifier of the block
+
+            Returns
+            -------
+            List of tuples in format (output_id, [1|0|Z|None]).
+        """
+        test = self.__node_type[blck_id]
+        if test == 'gate':
+            return [(self.dGrph[blck_id][1][1], self.dGrph[blck_id][1][2])]
+        elif test == 'tribuf':
+            return [tuple(self.dGrph[blck_id][2])]
+        elif test == 'cfg':
+            return [tuple(self.dGrph[blck_id][1])]
+        elif test == 'ari':
+            return [tuple(op) for op in self.dGrph[blck_id][1]]
+        return []
+
+    def __processBlcks(self, blck_id, values):
+        """
+            Processes the blocks and sets the values of each output node,
+            processing first the blocks driving the inputs not entered yet.
+            Note: Should only be called by from simulate function.
+
+            Parameters
+            ----------
+            blck_id : str
+                Identifier of the block
+            values : list
+                Value of every primary input and intermediate output, indexed
+                by the slots assigned in __buildKernel(). Built once per
+                simulation by simulate() and updated here as blocks get processed.
         """
         # Eliminating basic outliers
         if blck_id not in self.dGrph:
             print(blck_id, ' does not exist in the graph. Cannot process.')
             return
         
-        # Constructing a string of inputs to a given block
+        # Constructing an integer of inputs to a given block, the first
+        # input being the most significant bit
 
         # Find the input and retrieve it's value
-        # Tuple format: (io_id, io_source, io_value)
         # In io_source,'$' indicates prime_io, else it 
         # is replaced by the blck of origin.
-
-        ip_str = ''     # string storing all inputs
-        all_ios = self.__prime_ip + self.listIntermediateOps(True)
-        abort_processing = False
-        for ip in self.dGrph[blck_id][0]:    
-            found = False
-            for i in range(0, len(all_ios)):
-                if ip == all_ios[i][0]:
-                    found = True
-                    if all_ios[i][2] is not None:
-                        ip_str += str(all_ios[i][2])
-                    else:
-                        if all_ios[i][1] == '$':
-                            print('Primary input: ', ip, ' is not entered. Aborting processing blcks...')
-                            abort_processing = True
-                        else:
-                            print('Input: ', ip, ' is not entered. Processing blck: ', all_ios[i][1])
-                            # process the blck to get input
-                            if(self.__processBlcks(all_ios[i][1])):
-                                if len(self.dGrph[all_ios[i][1]]) == 2: # gates
-                                    ip_str += str(self.dGrph[all_ios[i][1]][1][2])
-                                else:
-                                    test = len(self.dGrph[all_ios[i][1]][1])
-                                    if test == 1:   # tribuf
-                                        ip_str += str(self.dGrph[all_ios[i][1]][2][1])
-                                    elif test == 2: # cfg
-                                        ip_str += str(self.dGrph[all_ios[i][1]][1][1])
-                                    elif test == 3: # ari
-                                        for op in self.dGrph[all_ios[i][1]][1]:
-                                            if op[0] == ip:
-                                                ip_str += str(op[1])
-                            else:
-                                print('Couldn\'t process blck: ', all_ios[i][1], '. Aborting processing blcks...')
-                                abort_processing = True
+        io_slot, io_src, _, _ = self.__buildKernel()
+
+        # Worklist of the blcks being processed, each in format
+        # [blck_id, position of the next input to read, integer of the inputs
+        # read so far (None once an input in Z state is found)]. A blck whose
+        # input is not entered yet is suspended while the blck driving that
+        # input is pushed on top of it.
+        stack = [[blck_id, 0, 0]]
+        on_stack = {blck_id}
+        while stack:
+            frame = stack[-1]
+            cur_id, pos, ip_int = frame
+            ips = self.dGrph[cur_id][0]
+            src = None
+            while pos < len(ips):
+                ip = ips[pos]
+                slot = io_slot.get(ip)
+                if slot is None:
+                    print('Could not find input: ', ip, ' for blck: ', cur_id, '. Aborting processing blcks...')
+                    return self.__abortBlcks(stack)
+                value = values[slot]
+                if value is None:
+                    src = io_src[slot]
+                    if src == '$':
+                        print('Primary input: ', ip, ' is not entered. Aborting processing blcks...')
+                        return self.__abortBlcks(stack)
+                    if src in on_stack:
+                        print('Blck: ', src, ' depends on its own output. Aborting processing blcks...')
+                        return self.__abortBlcks(stack)
+                    if self.verbose:
+                        print('Input: ', ip, ' is not entered. Processing blck: ', src)
                     break
-            if not found:
-                print('Could not find input: ', ip, ' for blck: ', blck_id, '. Aborting processing blcks...')
-                abort_processing = True
-            if abort_processing:
-                return False
-
-        # sanity check
-        # print('For: ', blck_id, ' ip_str: ', ip_str)
-        if len(ip_str) != len(self.dGrph[blck_id][0]):
-            print('It\'s a bug! ip_str: ', ip_str, ' blck: ', blck_id)
-            return False
-    
-        # Calculating output
-        # Differentiating between types of blocks
-        if len(self.dGrph[blck_id]) == 2: # gates
-            self.__processGates(blck_id, ip_str)
-        else:
-            test = len(self.dGrph[blck_id][1])
-            if test == 3:    # ari block
-                self.__processAriBlck(blck_id, ip_str)
-            elif test == 2:  # cfg block
-                self.__processCfgBlck(blck_id, ip_str)
-            elif test == 1:  # tribuf
-                self.__processTribuf(blck_id, ip_str)
+                if ip_int is not None:
+                    ip_int = None if value == 'Z' else (ip_int << 1) | value
+                pos += 1
+            frame[1], frame[2] = pos, ip_int
+
+            # process the blck to get input
+            if pos < len(ips):
+                stack.append([src, 0, 0])
+                on_stack.add(src)
+                continue
+
+            # Calculating output
+            # Differentiating between types of blocks
+            node = self.dGrph[cur_id]
+            test = self.__node_type[cur_id]
+            if test == 'gate':
+                self.__processGates(node, ip_int)
+            elif test == 'ari':
+                self.__processAriBlck(node, ip_int)
+            elif test == 'cfg':
+                self.__processCfgBlck(node, ip_int)
+            elif test == 'tribuf':
+                self.__processTribuf(node, ip_int)
             else:
                 print('Unknown error!\n')
-                return False
+                return self.__abortBlcks(stack)
+
+            # making the new output values visible to the blcks reading them
+            for op_id, value in self.__blckOps(cur_id):
+                slot = io_slot.get(op_id)
+                if slot is not None and io_src[slot] == cur_id:
+                    values[slot] = value
+
+            stack.pop()
+            on_stack.discard(cur_id)
+            if stack:
+                # resuming the suspended blck with the input just computed
+                frame = stack[-1]
+                value = values[io_slot[self.dGrph[frame[0]][0][frame[1]]]]
+                if frame[2] is not None:
+                    frame[2] = None if value == 'Z' else (frame[2] << 1) | value
+                frame[1] += 1
 
         return True
 
+    def __abortBlcks(self, stack):
+        """
+            Reports the blcks left unprocessed by __processBlcks() when it aborts.
+
+            Parameters
+            ----------
+            stack : list
+                Worklist of __processBlcks(), the blck that failed being on top
+
+            Returns
+            -------
+            False
+        """
+        for frame in reversed(stack[1:]):
+            print('Couldn\'t process blck: ', frame[0], '. Aborting processing blcks...')
+        return False
+
     def simulate(self, inputs = None, bit_str = None):
         """
             Simulates the hardware circuit described by the VerilogGraph.
@@ -1022,62 +1463,319 @@ class VerilogGraph:
             if len(inputs) != len(bit_str):
                 print('inputs and bit_str not of same length. Exiting simulation...')
                 return
-            # setting primary inputs
-            for i in range(0, len(inputs)):
-                self.setIpValue(inputs[i], int(bit_str[i]))
+            # setting primary inputs, same as setIpValue() which only
+            # remains called to report the ids which are not primary inputs
+            for ip, bit in zip(inputs, bit_str):
+                node = self.dGrph.get(ip)
+                if node is None or node[0] != 'i':
+                    self.setIpValue(ip, int(bit))
+                else:
+                    node[1] = int(int(bit) >= 1)
             
         self.__simSetup()
 
-        # iterating all cfg_blcks
-        blck_ids = [blck[0] for blck in self.listCfgBlcks()]
+        # value of every io, indexed by its slot; only the primary inputs
+        # are known before processing the blcks
+        io_slot, io_src, _, _ = self.__buildKernel()
+        values = [None] * len(io_src)
+        for ip in self.__prime_ip:
+            values[io_slot[ip]] = self.dGrph[ip][1]
+
+        # evaluating all blcks in dependency order, then the blcks on or
+        # behind a combinational loop
+        self.__runKernel(values)
+
+    def simulateBatch(self, inputs, bit_strs):
+        """
+            Simulates the hardware circuit for several input vectors at once.
+            Every blck is evaluated for all the vectors in a single step, which
+            amortizes the per-blck overhead of simulate(). Circuits whose blcks
+            cannot all be ordered, or which read a primary input that is neither
+            in 'inputs' nor set, are simulated one vector at a time with simulate().
+            Note: The node values in dGrph are not guaranteed to reflect any
+            of the vectors afterwards.
+
+            Parameters
+            ----------
+            inputs : List
+                List of primary input IDs.
+            bit_strs : List
+                List of strings of 0s and 1s, each representing one vector of
+                the primary 'inputs' set.
+            Eg: simulateBatch(['ip1', 'ip2'], ['00', '01', '10', '11'])
+
+            Returns
+            -------
+            List with one list of primary output values per vector, the outputs
+            being in the order of listPrimeIos().
+        """
+        # Eliminating basic outlier conditions
+        for bit_str in bit_strs:
+            if len(inputs) != len(bit_str):
+                print('inputs and bit_str: ', bit_str, ' not of same length. Exiting simulation...')
+                return
+        for ip in inputs:
+            if ip not in self.dGrph or self.dGrph[ip][0] != 'i':
+                print(ip, ' is not a primary input. Exiting simulation...')
+                return
 
-        for cfg_id in blck_ids:
-            if self.dGrph[cfg_id][1][1] == None:
-                if(self.__processBlcks(cfg_id)):
-                    print('Processed cfg_blck: ', cfg_id)
+        prime_ops = list(self.__prime_op)
+        io_slot, io_src, _, _ = self.__buildKernel()
+        n_vec = len(bit_strs)
+
+        # lanes of every io packed into a tuple of integers (v, z): bit k of v
+        # is the value of the io for vector k, and bit k of z is set if the io
+        # is in Z state for vector k
+        mask = (1 << n_vec) - 1
+        values = [None] * len(io_src)
+        for ip in self.__prime_ip:
+            if self.dGrph[ip][1] is not None:
+                values[io_slot[ip]] = (mask if self.dGrph[ip][1] else 0, 0)
+        for idx, ip in enumerate(inputs):
+            lanes = 0
+            for k, bit_str in enumerate(bit_strs):
+                if bit_str[idx] == '1':
+                    lanes |= 1 << k
+            values[io_slot[ip]] = (lanes, 0)
+
+        batch = self.__compileBatch()
+        if batch is None or any(values[slot] is None for slot in batch[1]):
+            results = []
+            for bit_str in bit_strs:
+                self.simulate(inputs, bit_str)
+                results.append([self.dGrph[op][1] for op in prime_ops])
+            return results
+
+        op_values = batch[0](values, mask)
+
+        results = []
+        for k in range(n_vec):
+            row = []
+            for lanes in op_values:
+                if lanes is None:
+                    row.append(None)
+                elif (lanes[1] >> k) & 1:
+                    row.append('Z')
                 else:
-                    print('Some error in processing cfg_blck: ', cfg_id)
-        
-        # iterating all ari_blcks
-        blck_ids = [blck[0] for blck in self.listAriBlcks()]
-
-        for ari_id in blck_ids:
-            # checking if one output is None because all outputs are set simultaneously
-            if self.dGrph[ari_id][1][0][1] == None:
-                if(self.__processBlcks(ari_id)):
-                    print('Processed ari_blck: ', ari_id)
+                    row.append((lanes[0] >> k) & 1)
+            results.append(row)
+        return results
+
+    def __buildBatchOrder(self, io_slot, io_src):
+        """
+            Orders all the blcks (cfg, ari, tribuf and gate) for simulateBatch()
+            such that every blck comes after the blcks driving its inputs.
+
+            Parameters
+            ----------
+            io_slot, io_src : see __buildKernel()
+
+            Returns
+            -------
+            Tuple in format (order, prime_ip_slots), order being a list of tuples
+            in format (blck_id, ip_slots) and prime_ip_slots the slots of the
+            primary inputs read by the blcks. None if an input is unknown or if
+            the blcks form a loop.
+        """
+        blck_ids = self.__cfg_ids + self.__ari_ids + self.__tribuf_ids + self.__gate_ids
+        in_degree = {}
+        successors = {blck_id: [] for blck_id in blck_ids}
+        blck_ips = {}
+        prime_ip_slots = set()
+        for blck_id in blck_ids:
+            ip_slots = []
+            for ip in self.dGrph[blck_id][0]:
+                slot = io_slot.get(ip)
+                if slot is None:
+                    return None
+                ip_slots.append(slot)
+            blck_ips[blck_id] = ip_slots
+            in_degree[blck_id] = 0
+            for slot in ip_slots:
+                if io_src[slot] == '$':
+                    prime_ip_slots.add(slot)
                 else:
-                    print('Some error in processing ari_blck: ', ari_id)
-        
-        # iterating all tribufs
-        blck_ids = [blck[0] for blck in self.listTribufs()]
+                    successors[io_src[slot]].append(blck_id)
+                    in_degree[blck_id] += 1
+
+        order = []
+        queue = deque([blck_id for blck_id in blck_ids if in_degree[blck_id] == 0])
+        while queue:
+            blck_id = queue.popleft()
+            order.append((blck_id, blck_ips[blck_id]))
+            for nxt in successors[blck_id]:
+                in_degree[nxt] -= 1
+                if in_degree[nxt] == 0:
+                    queue.append(nxt)
+
+        if len(order) != len(blck_ids):
+            return None
+        return order, sorted(prime_ip_slots)
+
+    def __compileBatch(self):
+        """
+            Generates and compiles a Python function which evaluates all the
+            blcks, in the order of __buildBatchOrder(), on packed lanes (see
+            simulateBatch()). Every blck becomes a few lines of bitwise
+            expressions on local variables, its truth table being expanded into
+            a multiplexer tree beforehand. Cached until the graph is modified.
 
-        for tri_id in blck_ids:
-            if self.dGrph[tri_id][2][1] == None:
-                if(self.__processBlcks(tri_id)):
-                    print('Processed tribuf: ', tri_id)
+            Returns
+            -------
+            Tuple in format (function, prime_ip_slots), or None if the blcks
+            cannot be ordered. function(values, M) takes the lanes of the ios
+            indexed by slot (only the primary inputs are read) and the lanes M
+            with every vector set to 1, and returns the lanes (v, z) of each
+            primary output in the order of __prime_op, None if not driven.
+        """
+        if self.__batch_fn is not None:
+            return self.__batch_fn or None
+
+        io_slot, io_src, _, _ = self.__buildKernel()
+        batch_order = self.__buildBatchOrder(io_slot, io_src)
+        if batch_order is None:
+            self.__batch_fn = False
+            return None
+        order, prime_ip_slots = batch_order
+        prime_idx = {op: k for k, op in enumerate(self.__prime_op)}
+
+        # Slots which are never in Z state (the primary inputs, and the outputs
+        # of blcks reading only such slots), for which no Z lanes are kept,
+        # and among them the slots holding a constant ('0' or 'M')
+        z_free = set(prime_ip_slots)
+        consts = {}
+
+        lines = ['def batch(values, M):']
+        for slot in prime_ip_slots:
+            lines.append('    v%d = values[%d][0]' % (slot, slot))
+        for k in range(len(self.__prime_op)):
+            lines.append('    p%d = None' % k)
+
+        for blck_id, ip_slots in order:
+            node = self.dGrph[blck_id]
+            test = self.__node_type[blck_id]
+            ips = [consts.get(slot, 'v%d' % slot) for slot in ip_slots]
+            # Z on any of the inputs
+            zs = ['z%d' % slot for slot in ip_slots if slot not in z_free]
+
+            if test == 'cfg':
+                outs = [self.__lutLanesExpr(node[2], ips)]
+            elif test == 'ari':
+                outs = self.__ariLanesExprs(node[2], ips, lines)
+            elif test == 'tribuf':
+                # Z unless ctrl is 1
+                zs.append('(M & ~%s)' % ips[1])
+                outs = [ips[0]]
+            else:
+                outs = [(' & ' if node[1][0] == 'A' else ' | ').join(ips)]
+            if zs:
+                lines.append('    z = ' + ' | '.join(zs))
+
+            for k, ((op_id, _), expr) in enumerate(zip(self.__blckOps(blck_id), outs)):
+                if zs:
+                    lines.append('    o%d = (%s) & ~z' % (k, expr))
                 else:
-                    print('Some error in processing tribuf: ', tri_id)
-        
-        # iterating all gates
-        blck_ids = [blck[0] for blck in self.listGates()]
+                    lines.append('    o%d = %s' % (k, expr))
+                slot = io_slot.get(op_id)
+                if slot is not None and io_src[slot] == blck_id:
+                    if zs:
+                        lines.append('    v%d, z%d = o%d, z' % (slot, slot, k))
+                    else:
+                        lines.append('    v%d = o%d' % (slot, k))
+                        z_free.add(slot)
+                        if expr in ('0', 'M'):
+                            consts[slot] = expr
+                targets = [op_id]
+                if test == 'cfg' or test == 'ari':
+                    targets += self.__op_fanout.get(op_id, [])
+                for target in targets:
+                    if target in prime_idx:
+                        lines.append('    p%d = (o%d, %s)' % (prime_idx[target], k, 'z' if zs else '0'))
+
+        lines.append('    return [%s]' % ', '.join('p%d' % k for k in range(len(self.__prime_op))))
+
+        namespace = {}
+        exec(compile('\n'.join(lines), '<VerilogGraph.simulateBatch>', 'exec'), namespace)
+        self.__batch_fn = (namespace['batch'], prime_ip_slots)
+        return self.__batch_fn
+
+    def __lutLanesExpr(self, lut, ips):
+        """
+            Expands a truth table into an expression of multiplexers on the
+            input lanes, folding it from the last input (the least significant
+            bit of the table index).
+
+            Parameters
+            ----------
+            lut : int
+                Truth table, bit i is the output for the inputs packed as i
+            ips : list
+                Expressions of the input lanes, the first input being the most
+                significant
 
-        for gate_id in blck_ids:
-            if self.dGrph[gate_id][1][2] == None:
-                if(self.__processBlcks(gate_id)):
-                    print('Processed gate: ', gate_id)
+            Returns
+            -------
+            Expression of the output lanes (str), with 'M' standing for the
+            lanes with every vector set to 1.
+        """
+        entries = ['M' if (lut >> i) & 1 else '0' for i in range(1 << len(ips))]
+        for x in reversed(ips):
+            folded = []
+            for a, b in zip(entries[0::2], entries[1::2]):
+                if x == '0' or x == 'M':
+                    # constant input, selecting one of the halves
+                    folded.append(a if x == '0' else b)
+                elif a == b:
+                    folded.append(a)
+                elif a == '0' and b == 'M':
+                    folded.append(x)
+                elif a == 'M' and b == '0':
+                    folded.append('(M & ~%s)' % x)
+                elif a == '0':
+                    folded.append('(%s & %s)' % (b, x))
+                elif b == '0':
+                    folded.append('(%s & ~%s)' % (a, x))
                 else:
-                    print('Some error in processing gate: ', gate_id)
+                    folded.append('((%s & ~%s) | (%s & %s))' % (a, x, b, x))
+            entries = folded
+        return entries[0]
 
-    def __randomStringGen(self, len):
+    def __ariLanesExprs(self, INIT, ips, lines):
         """
-            Generates a binary string of input length
+            Lane-wise counterpart of __evalAri(), see __lutLanesExpr().
+
+            Parameters
+            ----------
+            INIT : int
+                Configuration of the blck as integer
+            ips : list
+                Expressions of the input lanes [A, B, C, D, FCI]
+            lines : list
+                Lines of the generated function, the intermediataries F0 and
+                F1 are appended to it
+
+            Returns
+            -------
+            Expressions of the output lanes [Y, S, FCO].
         """
-        binString = ''
-        for _ in range(len):
-            binString = binString + str(random.randrange(100)%2)
+        A, B, C, D, FCI = ips
+        INIT16 = (INIT >> 16) & 1
+        INIT17 = (INIT >> 17) & 1
+        INIT18 = (INIT >> 18) & 1
+        INIT19 = (INIT >> 19) & 1
+
+        # intermediataries for calculating output
+        lines.append('    f0 = ' + self.__lutLanesExpr(INIT & 0xff, [B, C, D]))
+        lines.append('    f1 = ' + self.__lutLanesExpr((INIT >> 8) & 0xff, [B, C, D]))
+        lines.append('    y = (f0 & ~%s) | (f1 & %s)' % (A, A))
+        P = INIT19 | ((1 ^ INIT19) & INIT18)
+        if INIT16 and INIT17:
+            G = '(f0 | f1)'
+        else:
+            G = 'M' if INIT17 else '0'
 
-        return binString
+        # outputs
+        return ['y', 'y ^ %s' % FCI, FCI if P else G]
 
 
 # for unit testing this module
@@ -1151,3 +1849,29 @@ if __name__ == '__main__':
     vg.printAriBlcks(True)
     print(10*'-')
     vg.printTribufs(True)
+
+    # simulation - test 4: ari blck with an output driving two primary outputs,
+    # given as a list the way the parser maps a wire with two OUTBUFs
+    vg_fan = VerilogGraph()
+    for ip in ['i_1', 'i_2', 'i_3', 'i_4', 'i_5']:
+        vg_fan.addPrimeIo(ip, 'i')
+    vg_fan.addPrimeIo('o_1', 'o')
+    vg_fan.addPrimeIo('o_2', 'o')
+    vg_fan.addAriBlck('ari1', ['i_1', 'i_2', 'i_3', 'i_4', 'i_5'], [['o_1', 'o_2'], 'ari1_s', 'ari1_fco'], 'A5D21')
+    for k in range(32):
+        vg_fan.simulate(['i_1', 'i_2', 'i_3', 'i_4', 'i_5'], format(k, '05b'))
+        assert vg_fan.dGrph['o_1'][1] in (0, 1) and vg_fan.dGrph['o_2'][1] == vg_fan.dGrph['o_1'][1]
+
+    # printing
+    print('Simulation test 4')
+    vg_fan.printPrimeIos(True)
+
+    # simulation - test 5: simulateBatch() against simulate(), for every vector
+    ips = ['i_1', 'i_2', 'i_3', 'i_4', 'i_5']
+    bit_strs = [format(k, '05b') for k in range(32)]
+    batch = vg.simulateBatch(ips, bit_strs)
+    for bit_str, batch_ops in zip(bit_strs, batch):
+        vg.simulate(ips, bit_str)
+        assert batch_ops == [io[2] for io in vg.listPrimeIos(True) if io[1] == 'o'], bit_str
+    print('Simulation test 5')
+    print('simulateBatch() matches simulate() for', len(bit_strs), 'vectors')
@@ -8,9 +8,32 @@ import os
 # Importing RegEx package to perform search operations in string
 import re
 
+# chain to flatten the wire lists
+from itertools import chain
+
+# intern to share one string object per wire name
+from sys import intern
+
+# defaultdict to map every wire to the list of its primary inputs/outputs
+from collections import defaultdict
+
 # Importing graph_util package
 import graph_util as gu
 
+# Patterns used while parsing, compiled once
+_EQH_RE = re.compile(r'[=h;\n]')    # splits the INIT line of a module
+
+# First words of the lines which carry nothing to parse
+_SKIP_TOKENS = frozenset(('//', 'endmodule', '`timescale'))
+
+
+def _parenToken(line):
+    '''
+    Returns the token between the first pair of parentheses of a line, e.g. 'N1_c' for '.Y(N1_c),'
+    The token is interned, as the same wire names appear many times in a netlist
+    '''
+    return intern(line.partition('(')[2].partition(')')[0])
+
                 
 class Parser:
     '''
@@ -41,16 +64,14 @@ class Parser:
 
         # Reading the file
         with open(self.filePath, "r") as self.vmFile:
-            self.fData = self.vmFile.readlines()
-
-        self.lines = len(self.fData)  # Number of lines in the file
-        self.lineNo = 0          # Keeps a track of lineNo being read
+            self.fData = self.vmFile.read().splitlines(keepends=True)
 
         self.primeIp = []        # Stores primary input 
         self.primeOp = []        # Stores primary ouput
-        self.iobuf = {}          # Input buffer mapping (wire: Primary I/O)
-        self.CFGio = []          # Stores the configuration module details temporarily
-        self.ARI1io = []          # Stores the ARI1 module details temporarily
+        self.primeIpSet = set()  # Primary inputs, for membership tests
+        self.primeOpSet = set()  # Primary outputs, for membership tests
+        self.iobuf = defaultdict(list)  # Input buffer mapping (wire: [Primary I/O])
+        self.__singleIobuf = {}  # Wires of iobuf mapped to a single primary I/O (wire: Primary I/O)
         self.graph = gu.VerilogGraph() # VerilogGraph object
 
 
@@ -61,14 +82,22 @@ class Parser:
             1. iobuf: This is a dictionary which has key : value as wire : primary input/output
             2. cfgIO: This is the configuration module whose input/output needs to be mapped to primary input/output
         '''
+        singleIobuf = self.__singleIobuf
         for j in range(len(cfgIO)):
-            for key, value in self.iobuf.items():
-                if cfgIO[j] == key:
-                    if len(value) == 1:
-                        cfgIO[j] = value[0]
-                    elif len(value) > 1:
-                        self.__checkIO(value)
-                        cfgIO[j] = value
+            # most wires are mapped to a single primary input/output
+            single = singleIobuf.get(cfgIO[j])
+            if single is not None:
+                cfgIO[j] = single
+                continue
+            value = self.iobuf.get(cfgIO[j])
+            if value is None:
+                continue
+            # __checkIO() may have shortened the list to a single element
+            if len(value) == 1:
+                cfgIO[j] = value[0]
+            elif len(value) > 1:
+                self.__checkIO(value)
+                cfgIO[j] = value
 
 
     def __checkIO(self, wireList):
@@ -76,159 +105,109 @@ class Parser:
         Removes the primary output from the value list used in __mapIO() function, if the value list has both-
         a PI & PO
         '''
-        opFlag = 0
-        ipFlag = 0
-        for i in wireList:
-            for j in self.primeOp:
-                if i == j:
-                    opFlag += 1
-                    break
-            for k in self.primeIp:
-                if i == k:
-                    ipFlag += 1
-                    break
-            if ipFlag >= 1 and opFlag >= 1:
-                wireList.remove(j)
-                break
-
-
-    def __addDictElts(self, dict, key, value):
+        opHits = [i for i in wireList if i in self.primeOpSet]
+        if opHits and any(i in self.primeIpSet for i in wireList):
+            wireList.remove(opHits[0])
+
+
+    def __driverIO(self, inputs):
         '''
-        Adds element to dictionay. 
-        If the key already exists in the dictionary:
-            list of value is appended,
-        else
-            Adds the new key:value pair in the dictionary
+        Resolves the inputs of a module mapped to several primary inputs/outputs (see __mapIO())
+        The first element is the driving output, the rest are its fan out wires, hence the input is read from it
         '''
-
-        for keyItr, _ in dict.items():
-            if keyItr == key:
-                dict[key].append(value)
-                return
-        dict.update({key: [value]})
+        return [i[0] if type(i) == list else i for i in inputs]
 
 
     def __removeNestings(self, nestedList):
         '''
         Converts a nested list into a flat list
+        The elements are wires or lists of wires (see __mapIO()), hence one level of nesting is removed
         '''
-        output = []
-        for i in nestedList:
-            if type(i) == list:
-                output.extend(self.__removeNestings(i))
-            else:
-                output.append(i)
-        return output
+        return list(chain.from_iterable(i if type(i) == list else (i,) for i in nestedList))
                 
 
 
     def Parse(self):
 
         '''
-        Reads the complete file once, searching for buffers
+        Reads the complete file once, storing the buffers and collecting the CFG/ARI1 modules.
+        The modules are added to the graph once all the buffers are known, as a module can use
+        a wire whose buffer comes later in the file.
         '''
-        while 1:
-            # if the end of the file is reached, break
-            if self.lineNo >= self.lines:
-                break
+        # Local references to the attributes used for every line
+        graph = self.graph
+        iobuf = self.iobuf
+        pendingBlcks = []        # (module type, module name, ios, INIT line) in file order
 
-            # Splitting the current line into separate characters
-            self.lineData = self.fData[self.lineNo].split()
+        lineIter = iter(self.fData)
+        for line in lineIter:
+            # Splitting off the first two words of the current line, only these are looked at
+            lineData = line.split(None, 2)
 
             '''
             If the length of current line string is 0 or the first word in the line is '//'
             or 'endmodule' or '`timescale' or 'wire' then go to next line
             '''
-            if (len(self.lineData) == 0 or self.lineData[0] == '//' or
-                self.lineData[0] == 'endmodule' or self.lineData[0] == '`timescale'):
-                self.lineNo += 1
+            if not lineData or lineData[0] in _SKIP_TOKENS:
                 continue
+            first = lineData[0]
 
             #if the first word of the line is input, then store the name of primary input variable in input list
-            elif (self.lineData[0] == 'input' or (self.lineData[0] == 'wire' and 
-                 (self.lineData[1] == 'GND' or self.lineData[1] == 'VCC'))):
-                self.primeIp.append(self.lineData[1])
-                self.graph.addPrimeIo(self.lineData[1], 'i')
+            if (first == 'input' or (first == 'wire' and
+                 (lineData[1] == 'GND' or lineData[1] == 'VCC'))):
+                ip = intern(lineData[1])
+                self.primeIp.append(ip)
+                self.primeIpSet.add(ip)
+                graph.addPrimeIo(ip, 'i')
 
             # if the first word of the line is output, then store the name of primary output variable in output list   
-            elif self.lineData[0] == 'output':
-                self.primeOp.append(self.lineData[1])
-                self.graph.addPrimeIo(self.lineData[1], 'o')
+            elif first == 'output':
+                op = intern(lineData[1])
+                self.primeOp.append(op)
+                self.primeOpSet.add(op)
+                graph.addPrimeIo(op, 'o')
 
             # if the first word of the line is INBUF, then store the name of wire and primary input as a pair in inbuf list
-            elif self.lineData[0] == 'INBUF':
+            elif first == 'INBUF':
                 # Reading the input and output of buffer from next 2 lines
-                self.lineNo += 2
-                self.lineData = re.split('[()]', self.fData[self.lineNo-1] + self.fData[self.lineNo])
-                self.__addDictElts(self.iobuf, self.lineData[1], self.lineData[3])
-                #self.iobuf.update({self.lineData[1]: self.lineData[3]})
+                wireLine = next(lineIter)
+                padLine = next(lineIter)
+                iobuf[_parenToken(wireLine)].append(_parenToken(padLine))
 
             # if the first word of the line is OUTBUF, then store the name of wire and primary output as a pair in outbuf list
-            elif self.lineData[0] == 'OUTBUF':
+            elif first == 'OUTBUF':
                 # Reading the input and output of buffer from next 2 lines
-                self.lineNo += 2
-                self.lineData = re.split('[()]', self.fData[self.lineNo-1] + self.fData[self.lineNo])
-                #self.iobuf.update({self.lineData[3]: self.lineData[1]})
-                self.__addDictElts(self.iobuf, self.lineData[3], self.lineData[1])
-            
-            self.lineNo +=1
-        
-        self.lineNo = 0   # Resetting the line No for reading the file from start
-        
+                wireLine = next(lineIter)
+                padLine = next(lineIter)
+                iobuf[_parenToken(padLine)].append(_parenToken(wireLine))
+
+            # if the first word of the line starts with 'CFG' or is 'ARI1', then this is a configuration/ARI1 block used in the program
+            elif first.startswith('CFG') or first == 'ARI1':
+                blckType = 'ARI1' if first == 'ARI1' else 'CFG'
+                module = lineData[1]     # Storing the module name
+                blckIO = []              # Stores the module inputs & outputs
+                for line in lineIter:    # Until ');' keep reading the next line for inputs & outputs
+                    if line.startswith(');'):
+                        break
+                    blckIO.append(_parenToken(line))
+
+                lineData = _EQH_RE.split(next(lineIter))
+                pendingBlcks.append((blckType, module, blckIO, lineData[2]))
+
         '''
-        Parses the file line by line
+        Adds the modules to the graph, mapping their wires to the primary inputs/outputs
         '''
-        # print('Reading file for the second time', self.lineNo)
-        while 1:
-
-           # if the end of the file is reached, break
-            if self.lineNo >= self.lines:
-                break
-
-            # Splitting the current line into separate characters
-            self.lineData = self.fData[self.lineNo].split()
-
-            # if the first word of the line starts with 'CFG', then this is the configuration block used in the program
-            if (len(self.lineData) == 0 or self.lineData[0] == '//' or
-                self.lineData[0] == 'endmodule' or self.lineData[0] == '`timescale' or
-                self.lineData[0] == 'input' or (self.lineData[0] == 'wire' and 
-                (self.lineData[1] == 'GND' or self.lineData[1] == 'VCC')) or 
-                self.lineData[0] == 'output' or self.lineData[0] == 'INBUF' or 
-                self.lineData[0] == 'OUTBUF'):
-                pass
-            
-            elif re.match('^C+F+G', self.lineData[0]):
-                self.module = self.lineData[1]     # Storing the module name
-                self.lineNo += 1        
-                while self.fData[self.lineNo] != ');\n':    # Until ');' keep reading the next line for inputs & outputs
-                    self.lineData = re.split('[()]', self.fData[self.lineNo]) 
-                    self.CFGio.append(self.lineData[1])
-                    self.lineNo += 1
-                    
-                self.lineNo += 1
-                self.lineData = re.split('[=h;\n]', self.fData[self.lineNo])
-                self.__mapIO(self.CFGio)
-                #print(self.CFGio)
-                print('CFGid- ', self.module, self.__removeNestings([self.CFGio[i] for i in range(len(self.CFGio)-1)]), '| output:  ', self.__removeNestings([self.CFGio[len(self.CFGio)-1]]))
-                self.graph.addCfgBlck(self.module, self.__removeNestings([self.CFGio[i] for i in range(len(self.CFGio)-1)]), self.__removeNestings([self.CFGio[len(self.CFGio)-1]]), self.lineData[2])
-                self.CFGio = []
-
-            # if the first word of the line starts with 'ARI1', then this is the ARI1 module used in the program
-            elif self.lineData[0] == 'ARI1':
-                self.module = self.lineData[1]      # Storing the module name
-                self.lineNo += 1        
-                while self.fData[self.lineNo] != ');\n':    # Until ');' keep reading the next line for inputs & outputs
-                    self.lineData = re.split('[()]', self.fData[self.lineNo]) 
-                    self.ARI1io.append(self.lineData[1])
-                    self.lineNo += 1
-
-                self.lineNo += 1
-                self.lineData = re.split('[=h;\n]', self.fData[self.lineNo])
-                self.__mapIO(self.ARI1io)
-                self.graph.addAriBlck(self.module, [self.ARI1io[i] for i in range(3,8)], [self.ARI1io[i] for i in range(3)], self.lineData[2])
-                self.ARI1io = []
-                
-            self.lineNo += 1 # Incrementing the lineNo to read next line
+        self.__singleIobuf = {wire: value[0] for wire, value in iobuf.items() if len(value) == 1}
+        for blckType, module, blckIO, config in pendingBlcks:
+            self.__mapIO(blckIO)
+            if blckType == 'CFG':
+                #print(blckIO)
+                cfgIp = self.__driverIO(blckIO[:-1])
+                cfgOp = self.__removeNestings(blckIO[-1:])
+                print('CFGid- ', module, cfgIp, '| output:  ', cfgOp)
+                graph.addCfgBlck(module, cfgIp, cfgOp, config)
+            else:
+                graph.addAriBlck(module, self.__driverIO(blckIO[3:8]), blckIO[:3], config)
 
 
 '''